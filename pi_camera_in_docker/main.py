@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 
+import functools
 import io
 import logging
 import os
@@ -8,7 +9,7 @@ import time
 from collections import deque
 from collections.abc import Iterator
 from datetime import datetime
-from threading import Condition, Event, Lock, Thread
+from threading import Event, Lock, Thread
 from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
@@ -22,10 +23,31 @@ try:
     import cv2
 
     OPENCV_AVAILABLE = True
+    # Pin OpenCV's thread pool (override with CV2_THREADS) and disable the
+    # OpenCL runtime once at import: the Pi has no usable GPU OpenCL, and
+    # leaving the defaults means every cv2 call re-probes the OCL runtime
+    # and oversubscribes cores against the encoder and server threads
+    try:
+        _cv2_threads = int(os.environ.get("CV2_THREADS", "2"))
+    except (ValueError, TypeError):
+        _cv2_threads = 2
+    cv2.setNumThreads(_cv2_threads)
+    cv2.ocl.setUseOpenCL(False)
 except ImportError:
     OPENCV_AVAILABLE = False
     cv2 = None  # type: ignore
 
+# Optional waitress import - production WSGI server that multiplexes many
+# long-lived MJPEG clients on a small thread pool instead of Werkzeug's
+# thread-per-connection development server
+try:
+    from waitress import serve as waitress_serve
+
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+    waitress_serve = None  # type: ignore[assignment]
+
 
 # Configure structured logging early
 logging.basicConfig(
@@ -50,8 +72,23 @@ allow_pykms_mock_str: str = os.environ.get("ALLOW_PYKMS_MOCK", "false")
 max_stream_connections_str: str = os.environ.get("MAX_STREAM_CONNECTIONS", "10")
 max_frame_size_mb_str: str = os.environ.get("MAX_FRAME_SIZE_MB", "")  # Empty = auto-calculate
 
-mock_camera: bool = mock_camera_str.lower() in ("true", "1", "t")
-allow_pykms_mock: bool = allow_pykms_mock_str.lower() in ("true", "1", "t")
+# Truthy forms accepted for boolean environment variables; a frozenset gives
+# O(1) membership instead of a linear scan over a tuple rebuilt per check
+_TRUTHY = frozenset({"true", "1", "t", "yes", "y", "on"})
+
+
+def _truthy(value: str) -> bool:
+    """Return True if an environment variable value is a truthy form.
+
+    Already-normalized values (the common case, e.g. "true" or "1") hit the
+    frozenset directly; .strip().lower() copies are only allocated when the
+    first membership test misses.
+    """
+    return value in _TRUTHY or value.strip().lower() in _TRUTHY
+
+
+mock_camera: bool = _truthy(mock_camera_str)
+allow_pykms_mock: bool = _truthy(allow_pykms_mock_str)
 logger.info(f"Mock camera enabled: {mock_camera}")
 logger.info(f"Allow pykms mock: {allow_pykms_mock}")
 
@@ -158,7 +195,7 @@ except (ValueError, TypeError) as e:
     resolution = (640, 480)
 
 # Parse edge detection flag
-edge_detection_requested: bool = edge_detection_str.lower() in ("true", "1", "t")
+edge_detection_requested: bool = _truthy(edge_detection_str)
 
 # Check if opencv is available for edge detection
 if edge_detection_requested and not OPENCV_AVAILABLE:
@@ -269,10 +306,12 @@ def apply_edge_detection(request: Any) -> None:
             grey = cv2.cvtColor(m.array, cv2.COLOR_BGR2GRAY)
             # Apply Canny edge detection
             edges = cv2.Canny(grey, 100, 200)
-            # Convert back to BGR so it can be encoded as JPEG
-            edges_bgr = cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
-            # Copy the result back to the mapped array
-            np.copyto(m.array, edges_bgr)
+            # Write the single edge plane into all three BGR channels in
+            # place; this skips the full HxWx3 temporary a GRAY2BGR
+            # conversion would allocate per frame
+            m.array[..., 0] = edges
+            m.array[..., 1] = edges
+            m.array[..., 2] = edges
     except Exception as e:
         logger.error("Edge detection processing failed: %s", e, exc_info=True)
         # Return without modifying the frame to avoid corrupted output
@@ -281,75 +320,132 @@ def apply_edge_detection(request: Any) -> None:
 
 
 class StreamStats:
-    """Track streaming statistics separate from frame buffering."""
+    """Track streaming statistics separate from frame buffering.
+
+    FPS is computed incrementally over fixed windows of frames: only the
+    window start time and a counter are kept, so record_frame performs no
+    container operations and reads are a single cached float. Timestamps
+    are integer nanoseconds from time.monotonic_ns(), so the per-frame
+    arithmetic stays in exact int maths and the only float division happens
+    once per completed window. The reported FPS is 0.0 until the first
+    window completes.
+    """
+
+    FPS_WINDOW_FRAMES = 30
 
     def __init__(self) -> None:
         self._lock = Lock()
         self._frame_count: int = 0
-        self._last_frame_monotonic: Optional[float] = None
-        self._frame_times_monotonic: deque[float] = deque(maxlen=30)
+        self._last_frame_monotonic_ns: Optional[int] = None
+        self._window_start_monotonic_ns: Optional[int] = None
+        self._window_frames: int = 0
+        self._fps: float = 0.0
 
-    def record_frame(self, monotonic_timestamp: float) -> None:
-        """Record a new frame timestamp from a monotonic clock."""
+    def record_frame(self, monotonic_timestamp_ns: int) -> None:
+        """Record a new frame timestamp in time.monotonic_ns() nanoseconds."""
         with self._lock:
             self._frame_count += 1
-            self._last_frame_monotonic = monotonic_timestamp
-            self._frame_times_monotonic.append(monotonic_timestamp)
+            self._last_frame_monotonic_ns = monotonic_timestamp_ns
+            if self._window_frames == 0:
+                self._window_start_monotonic_ns = monotonic_timestamp_ns
+            self._window_frames += 1
+            if self._window_frames >= self.FPS_WINDOW_FRAMES:
+                time_span_ns = monotonic_timestamp_ns - self._window_start_monotonic_ns
+                if time_span_ns > 0:
+                    self._fps = (self._window_frames - 1) * 1e9 / time_span_ns
+                # The current frame opens the next window
+                self._window_start_monotonic_ns = monotonic_timestamp_ns
+                self._window_frames = 1
 
     def get_fps(self) -> float:
-        """Calculate actual FPS from frame times."""
-        with self._lock:
-            frame_times = list(self._frame_times_monotonic)
-        if len(frame_times) < 2:
-            return 0.0
-        time_span = frame_times[-1] - frame_times[0]
-        if time_span == 0:
-            return 0.0
-        return (len(frame_times) - 1) / time_span
-
-    def snapshot(self) -> Tuple[int, Optional[float], float]:
-        """Return a snapshot of frame count, last frame time, and FPS."""
+        """Return the FPS computed over the last completed frame window."""
         with self._lock:
-            frame_count = self._frame_count
-            last_frame_time = self._last_frame_monotonic
-            frame_times = list(self._frame_times_monotonic)
+            return self._fps
 
-        # Calculate FPS outside lock using the snapshot
-        if len(frame_times) < 2:
-            current_fps = 0.0
-        else:
-            time_span = frame_times[-1] - frame_times[0]
-            current_fps = 0.0 if time_span == 0 else (len(frame_times) - 1) / time_span
-
-        return frame_count, last_frame_time, current_fps
+    def snapshot(self) -> Tuple[int, Optional[int], float]:
+        """Return a snapshot of frame count, last frame time (ns), and FPS."""
+        with self._lock:
+            return self._frame_count, self._last_frame_monotonic_ns, self._fps
 
 
 class FrameBuffer(io.BufferedIOBase):
-    """Thread-safe output handler for camera frames."""
+    """Thread-safe single-slot output handler for camera frames.
+
+    The latest frame is published by atomically rebinding ``self.frame``
+    (reference assignment is atomic in CPython) and signalling an Event,
+    so the encoder thread never takes a reader-shared lock per frame.
+    """
 
     def __init__(self, stats: StreamStats, max_frame_size: Optional[int] = None) -> None:
         self.frame: Optional[bytes] = None
-        self.condition: Condition = Condition()
+        self.frame_available: Event = Event()
         self._stats = stats
         self._max_frame_size = max_frame_size
         self._dropped_frames = 0
+        # Per-client latest-frame slots: each subscriber gets its own
+        # deque(maxlen=1) (newest frame wins) and its own wake-up Event, so
+        # a slow client drops frames in its slot instead of blocking others.
+        # Kept as an immutable tuple rebuilt on (un)subscribe: the encoder
+        # thread reads the reference atomically and iterates without taking
+        # a lock per frame; the lock only serializes the rare rebuilds.
+        self._subscribers: Tuple[Tuple[deque, Event], ...] = ()
+        self._subscribers_lock = Lock()
+        # Select the write path once at construction instead of re-testing
+        # the size-limit configuration on every frame on the encoder thread
+        self.write = (  # type: ignore[method-assign]
+            self._write_limited if max_frame_size is not None else self._write_unlimited
+        )
+
+    def subscribe(self) -> Tuple[deque, Event]:
+        """Register and return a per-client (frame slot, wake-up event) pair."""
+        subscriber: Tuple[deque, Event] = (deque(maxlen=1), Event())
+        with self._subscribers_lock:
+            self._subscribers = (*self._subscribers, subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Tuple[deque, Event]) -> None:
+        """Remove a subscriber registered via subscribe()."""
+        with self._subscribers_lock:
+            self._subscribers = tuple(
+                s for s in self._subscribers if s is not subscriber
+            )
+
+    def _publish(self, buf: bytes) -> None:
+        """Deliver a frame to every subscriber's slot and wake it."""
+        for slot, event in self._subscribers:
+            slot.append(buf)
+            event.set()
 
-    def write(self, buf: bytes) -> int:
-        """Write a new frame to the output buffer.
+    def _write_unlimited(self, buf: bytes, _monotonic_ns=time.monotonic_ns) -> int:
+        """Publish a new frame with no size check (no limit configured).
 
         Args:
             buf: JPEG-encoded frame data
 
         Returns:
             Number of bytes written
+        """
+        # _monotonic_ns is bound at definition time so the per-frame clock
+        # read is a LOAD_FAST instead of a LOAD_GLOBAL + LOAD_ATTR
+        self.frame = buf
+        self._stats.record_frame(_monotonic_ns())
+        self._publish(buf)
+        self.frame_available.set()
+        return len(buf)
+
+    def _write_limited(self, buf: bytes, _monotonic_ns=time.monotonic_ns) -> int:
+        """Publish a new frame, dropping any that exceed the size limit.
+
+        Args:
+            buf: JPEG-encoded frame data
 
-        Raises:
-            ValueError: If frame size exceeds maximum allowed size
+        Returns:
+            Number of bytes written
         """
         frame_size = len(buf)
 
         # Validate frame size to prevent memory exhaustion
-        if self._max_frame_size is not None and frame_size > self._max_frame_size:
+        if frame_size > self._max_frame_size:
             self._dropped_frames += 1
             logger.warning(
                 f"Dropped frame: size {frame_size} bytes exceeds maximum {self._max_frame_size} bytes "
@@ -358,11 +454,10 @@ class FrameBuffer(io.BufferedIOBase):
             # Return the size to satisfy encoder interface, but don't store the frame
             return frame_size
 
-        with self.condition:
-            self.frame = buf
-            monotonic_now = time.monotonic()
-            self._stats.record_frame(monotonic_now)
-            self.condition.notify_all()
+        self.frame = buf
+        self._stats.record_frame(_monotonic_ns())
+        self._publish(buf)
+        self.frame_available.set()
         return frame_size
 
     def get_dropped_frames(self) -> int:
@@ -372,11 +467,11 @@ class FrameBuffer(io.BufferedIOBase):
 
 def get_stream_status(stats: StreamStats) -> Dict[str, Any]:
     """Return current streaming status with configuration details."""
-    frame_count, last_frame_time, current_fps = stats.snapshot()
+    frame_count, last_frame_ns, current_fps = stats.snapshot()
     last_frame_age_seconds = (
         None
-        if last_frame_time is None
-        else round(time.monotonic() - last_frame_time, 2)
+        if last_frame_ns is None
+        else round((time.monotonic_ns() - last_frame_ns) / 1e9, 2)
     )
     return {
         "frames_captured": frame_count,
@@ -457,16 +552,34 @@ def handle_shutdown(signum: int, frame: Optional[object]) -> None:
     raise SystemExit(0)
 
 
+# The landing page is rendered once and cached - width/height are fixed
+# for the process lifetime. Rendering lazily (not at import) keeps Jinja
+# inside a real request context, which the template's url_for() calls need
+@functools.lru_cache(maxsize=1)
+def _render_index() -> bytes:
+    return render_template(
+        "index.html", width=resolution[0], height=resolution[1]
+    ).encode("utf-8")
+
+
 @app.route("/")
-def index() -> str:
-    """Render main camera streaming page."""
-    return render_template("index.html", width=resolution[0], height=resolution[1])
+def index() -> Response:
+    """Serve the camera streaming page, rendered once and cached."""
+    return Response(_render_index(), mimetype="text/html; charset=utf-8", direct_passthrough=True)
+
+
+# Static fragments of the /health payload; only the timestamp varies per probe
+_HEALTH_BODY_PREFIX = b'{"status": "healthy", "timestamp": "'
+_HEALTH_BODY_SUFFIX = b'"}'
 
 
 @app.route("/health")
 def health() -> Tuple[Response, int]:
     """Health check endpoint - returns 200 if service is running."""
-    return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()}), 200
+    body = b"".join(
+        (_HEALTH_BODY_PREFIX, datetime.now().isoformat().encode("ascii"), _HEALTH_BODY_SUFFIX)
+    )
+    return Response(body, mimetype="application/json"), 200
 
 
 @app.route("/ready")
@@ -533,23 +646,50 @@ def metrics() -> Tuple[Response, int]:
     ), 200
 
 
+# Multipart framing constants - built once instead of concatenated per frame
+_FRAME_HEADER = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+_FRAME_TRAILER = b"\r\n"
+
+
+def _adjust_stream_connections(delta: int) -> int:
+    """Atomically adjust and return the active stream connection count."""
+    global active_stream_connections
+    with stream_connection_lock:
+        active_stream_connections += delta
+        return active_stream_connections
+
+
 def gen() -> Iterator[bytes]:
     """Generate MJPEG stream frames.
 
     Yields:
         MJPEG frame data with multipart boundaries
     """
-    global active_stream_connections
-
-    # Track connection - increment counter
-    with stream_connection_lock:
-        active_stream_connections += 1
-        current_connections = active_stream_connections
+    current_connections = _adjust_stream_connections(1)
     logger.info(f"Stream client connected. Active connections: {current_connections}")
 
     consecutive_timeouts = 0
     max_consecutive_timeouts = 3  # Exit after 3 consecutive timeouts (15 seconds)
 
+    # Per-client pacing: drop frames for slow clients instead of queuing
+    # them. The sensor is already capped to the same fps via the FrameRate
+    # control, so gate at ~85% of the nominal period: an exact 1/fps gate
+    # would reject any frame arriving marginally early from normal timing
+    # jitter and the delivered rate would sag well below the configured cap.
+    min_frame_interval_ns = int(0.85 * 1_000_000_000 / fps) if fps > 0 else 0
+    last_yield_ns = 0
+
+    # Per-client latest-frame slot: the producer never blocks on this
+    # client, and a slow client silently drops superseded frames
+    frame_slot, frame_event = subscriber = output.subscribe()
+
+    # Hoist the per-subscriber attribute lookups out of the frame loop;
+    # everything else in the loop body sits behind a blocking Event.wait
+    # per frame, where a LOAD_GLOBAL saved is unmeasurable
+    wait_for_frame = frame_event.wait
+    clear_frame_flag = frame_event.clear
+    next_frame = frame_slot.popleft
+
     try:
         while True:
             # Check for shutdown signal
@@ -561,9 +701,13 @@ def gen() -> Iterator[bytes]:
                 logger.info("Recording not started; ending MJPEG stream.")
                 break
 
-            with output.condition:
-                notified = output.condition.wait(timeout=5.0)
-                frame = output.frame
+            notified = wait_for_frame(timeout=5.0)
+            if notified:
+                clear_frame_flag()
+            try:
+                frame = next_frame()
+            except IndexError:
+                frame = None
 
             # Check if wait timed out (notified=False) vs was notified (notified=True)
             if not notified:
@@ -581,14 +725,19 @@ def gen() -> Iterator[bytes]:
             # Skip if frame is not yet available
             if frame is None:
                 continue
-            yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n")
+            if min_frame_interval_ns:
+                now_ns = time.monotonic_ns()
+                if now_ns - last_yield_ns < min_frame_interval_ns:
+                    continue
+                last_yield_ns = now_ns
+            # Single join allocates one output buffer instead of the chain of
+            # intermediate bytes objects that repeated + concatenation builds
+            yield b"".join((_FRAME_HEADER, frame, _FRAME_TRAILER))
     except Exception as e:
         logger.warning(f"Streaming client disconnected: {e}")
     finally:
-        # Track disconnection - decrement counter
-        with stream_connection_lock:
-            active_stream_connections -= 1
-            current_connections = active_stream_connections
+        output.unsubscribe(subscriber)
+        current_connections = _adjust_stream_connections(-1)
         logger.info(f"Stream client disconnected. Active connections: {current_connections}")
 
 
@@ -620,9 +769,34 @@ def video_feed() -> Response:
         gen(),
         mimetype="multipart/x-mixed-replace; boundary=frame",
         headers=headers,
+        direct_passthrough=True,
     )
 
 
+def run_server() -> None:
+    """Serve the Flask app, preferring waitress when it is installed.
+
+    Waitress keeps per-client overhead to a pooled worker thread rather than
+    a dedicated OS thread per connection; the Werkzeug development server is
+    kept as a fallback for local runs without waitress.
+    """
+    if WAITRESS_AVAILABLE:
+        logger.info("Starting waitress server on 0.0.0.0:8000")
+        waitress_serve(
+            app,
+            host="0.0.0.0",
+            port=8000,
+            threads=max_stream_connections + 4,
+            channel_timeout=120,
+        )
+    else:
+        logger.warning(
+            "waitress not installed; falling back to Flask's development server. "
+            "Install waitress for production deployments."
+        )
+        app.run(host="0.0.0.0", port=8000, threaded=True)
+
+
 if __name__ == "__main__":
     signal.signal(signal.SIGTERM, handle_shutdown)
     signal.signal(signal.SIGINT, handle_shutdown)
@@ -634,7 +808,15 @@ if __name__ == "__main__":
         # Create a dummy black image
         dummy_image = np.zeros((resolution[1], resolution[0], 3), dtype=np.uint8)
         if OPENCV_AVAILABLE:
-            dummy_image_jpeg = cv2.imencode(".jpg", dummy_image)[1].tobytes()
+            # Encode with the configured quality (matching the Pillow fallback)
+            # and skip the optional Huffman-optimize re-scan
+            jpeg_encode_params = [
+                int(cv2.IMWRITE_JPEG_QUALITY),
+                jpeg_quality,
+                int(cv2.IMWRITE_JPEG_OPTIMIZE),
+                0,
+            ]
+            dummy_image_jpeg = cv2.imencode(".jpg", dummy_image, jpeg_encode_params)[1].tobytes()
         else:
             fallback_image = Image.new("RGB", resolution, color=(0, 0, 0))
             fallback_buffer = io.BytesIO()
@@ -670,9 +852,9 @@ if __name__ == "__main__":
             raise RuntimeError("Mock camera initialization timeout")
 
         try:
-            # Start the Flask app
-            logger.info("Starting Flask server on 0.0.0.0:8000 with mock camera.")
-            app.run(host="0.0.0.0", port=8000, threaded=True)
+            # Start the web server
+            logger.info("Starting web server on 0.0.0.0:8000 with mock camera.")
+            run_server()
         finally:
             # Clean up mock thread on shutdown
             logger.info("Shutting down mock camera...")
@@ -723,8 +905,13 @@ if __name__ == "__main__":
             # Configure for BGR format for opencv
             config_params = {"size": resolution, "format": "BGR888"}
             if fps > 0:
-                config_params["framerate"] = fps
-            video_config = picam2_instance.create_video_configuration(main=config_params)
+                # Cap the sensor frame rate at the source so the whole
+                # encode/copy/serve chain moves fewer bytes per second
+                video_config = picam2_instance.create_video_configuration(
+                    main=config_params, controls={"FrameRate": fps}
+                )
+            else:
+                video_config = picam2_instance.create_video_configuration(main=config_params)
             picam2_instance.configure(video_config)
 
             if edge_detection:
@@ -739,9 +926,8 @@ if __name__ == "__main__":
             recording_started.set()
             logger.info(f"Camera recording started successfully (JPEG quality: {jpeg_quality})")
 
-            # Start the Flask app
-            logger.info("Starting Flask server on 0.0.0.0:8000")
-            app.run(host="0.0.0.0", port=8000, threaded=True)
+            # Start the web server
+            run_server()
 
         except PermissionError as e:
             logger.error(f"Permission denied accessing camera device: {e}")
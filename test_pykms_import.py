@@ -83,42 +83,40 @@ logger.info("\n[Test 2] AttributeError scenario (incomplete pykms)")
 logger.info("-" * 60)
 
 try:
-    # Create incomplete pykms mock (missing PixelFormat)
-    incomplete_pykms = types.ModuleType("pykms")
-    incomplete_kms = types.ModuleType("kms")
+    # Strip PixelFormat from the mock that is already registered instead of
+    # deleting the picamera2 module tree and re-importing it. The second full
+    # import (libcamera, numpy, ...) dominated this script's runtime; the
+    # attribute surface DrmPreview depends on can be probed directly on the
+    # already-loaded modules.
+    incomplete_pykms = sys.modules.get("pykms") or types.ModuleType("pykms")
+    incomplete_kms = sys.modules.get("kms") or types.ModuleType("kms")
+    for mock_module in (incomplete_pykms, incomplete_kms):
+        if hasattr(mock_module, "PixelFormat"):
+            del mock_module.PixelFormat
     sys.modules["pykms"] = incomplete_pykms
     sys.modules["kms"] = incomplete_kms
 
-    logger.info("✓ Incomplete pykms module created (no PixelFormat attribute)")
+    logger.info("✓ pykms mock stripped to an incomplete module (no PixelFormat attribute)")
 
-    # This should trigger AttributeError which the workaround should catch
+    # Re-import only the leaf module that actually consumes pykms.PixelFormat
+    # at import time. The rest of the picamera2 tree (libcamera, numpy, ...)
+    # stays cached from Test 1, so this drives the real consumer through the
+    # incomplete-pykms failure without the expensive full-tree re-import.
+    sys.modules.pop("picamera2.previews.drm_preview", None)
     try:
-        # Force reimport by removing picamera2 from cache
-        if "picamera2" in sys.modules:
-            del sys.modules["picamera2"]
-        if "picamera2.previews" in sys.modules:
-            del sys.modules["picamera2.previews"]
-        if "picamera2.previews.drm_preview" in sys.modules:
-            del sys.modules["picamera2.previews.drm_preview"]
-
-        picamera2_module = importlib.import_module("picamera2")
-        _ = picamera2_module.Picamera2
-        logger.warning("⚠️  Note: picamera2 imported without error (may have internal fallback)")
+        importlib.import_module("picamera2.previews.drm_preview")
+        logger.error(
+            "❌ FAIL: drm_preview imported against incomplete pykms; "
+            "the AttributeError branch of the workaround is untestable"
+        )
+        sys.exit(1)
     except AttributeError as attr_error:
-        if "PixelFormat" in str(attr_error):
-            logger.info("✓ Expected AttributeError caught: %s", attr_error)
-            logger.info("✓ This error would be caught by the enhanced workaround in main.py")
-        else:
-            logger.error("❌ FAIL: Unexpected AttributeError: %s", attr_error)
-            sys.exit(1)
+        logger.info("✓ Expected AttributeError from drm_preview: %s", attr_error)
+        logger.info("✓ This error is caught by the enhanced workaround in main.py")
 
     logger.info("\n✅ SUCCESS: All pykms import workaround tests passed!")
     sys.exit(0)
 
-except ImportError as e:
-    logger.warning("⚠️  WARNING: picamera2 not installed: %s", e)
-    logger.warning("Workaround logic verified as correct.")
-    sys.exit(0)
 except Exception as e:
     logger.error("❌ FAIL: Unexpected error in Test 2: %s", e)
     sys.exit(1)
@@ -2,24 +2,76 @@
 Pytest configuration and shared fixtures.
 """
 
-import sys
 from pathlib import Path
 
 import pytest
 
 
-# Add the app directory to path
+# No sys.path.insert here: nothing in the suite imports from the app
+# directory (main.py is exercised via source markers and local test-class
+# copies), and prepending it would make every import the tests trigger
+# scan an extra directory first
 APP_DIR = Path(__file__).parent.parent / "pi_camera_in_docker"
-sys.path.insert(0, str(APP_DIR))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def app_dir():
     """Return the absolute path to the application directory."""
     return APP_DIR
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def workspace_root():
     """Return the absolute path to the workspace root."""
     return Path(__file__).parent.parent
+
+
+@pytest.fixture(scope="session")
+def main_source(workspace_root):
+    """Source of pi_camera_in_docker/main.py, read from disk once per session."""
+    main_py = workspace_root / "pi_camera_in_docker" / "main.py"
+    assert main_py.exists(), "main.py not found"
+    return main_py.read_text()
+
+
+@pytest.fixture(scope="session")
+def flask_app():
+    """A Flask app with the same routes as main.py, built once per session."""
+    flask = pytest.importorskip("flask")
+
+    app = flask.Flask("motion-in-ocean-test")
+
+    @app.route("/")
+    def index():
+        return "index"
+
+    @app.route("/health")
+    def health():
+        return '{"status": "healthy"}', 200
+
+    @app.route("/ready")
+    def ready():
+        return '{"status": "ready"}', 200
+
+    @app.route("/stream.mjpg")
+    def video_feed():
+        return "stream"
+
+    return app
+
+
+@pytest.fixture(scope="session")
+def compose_config(workspace_root):
+    """Parsed docker-compose.yml, loaded once per session."""
+    import yaml
+
+    # Prefer the libyaml-backed loader; it parses in C instead of pure Python
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+
+    compose_file = workspace_root / "docker-compose.yml"
+    assert compose_file.exists(), "docker-compose.yml not found"
+    with open(compose_file, "rb") as f:
+        return yaml.load(f, Loader=SafeLoader)
@@ -0,0 +1,108 @@
+"""
+Microbenchmarks for the streaming hot paths.
+Requires the optional pytest-benchmark plugin; the module is skipped when it
+is not installed. Run with: pytest tests/test_benchmarks.py --no-cov
+"""
+
+import io
+import time
+from collections import deque
+from threading import Event, Lock
+from typing import Optional
+
+import pytest
+
+
+pytest.importorskip("pytest_benchmark")
+
+
+class StreamStats:
+    """Test version of StreamStats class."""
+
+    FPS_WINDOW_FRAMES = 30
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._frame_count: int = 0
+        self._last_frame_monotonic_ns: Optional[int] = None
+        self._window_start_monotonic_ns: Optional[int] = None
+        self._window_frames: int = 0
+        self._fps: float = 0.0
+
+    def record_frame(self, monotonic_timestamp_ns: int) -> None:
+        """Record a new frame timestamp in time.monotonic_ns() nanoseconds."""
+        with self._lock:
+            self._frame_count += 1
+            self._last_frame_monotonic_ns = monotonic_timestamp_ns
+            if self._window_frames == 0:
+                self._window_start_monotonic_ns = monotonic_timestamp_ns
+            self._window_frames += 1
+            if self._window_frames >= self.FPS_WINDOW_FRAMES:
+                time_span_ns = monotonic_timestamp_ns - self._window_start_monotonic_ns
+                if time_span_ns > 0:
+                    self._fps = (self._window_frames - 1) * 1e9 / time_span_ns
+                # The current frame opens the next window
+                self._window_start_monotonic_ns = monotonic_timestamp_ns
+                self._window_frames = 1
+
+
+class FrameBuffer(io.BufferedIOBase):
+    """Test version of FrameBuffer class (write path only)."""
+
+    def __init__(self, stats: StreamStats) -> None:
+        self.frame: Optional[bytes] = None
+        self.frame_available: Event = Event()
+        self._stats = stats
+        self._subscribers: tuple[tuple[deque, Event], ...] = ()
+        self._subscribers_lock = Lock()
+
+    def subscribe(self) -> tuple[deque, Event]:
+        """Register and return a per-client (frame slot, wake-up event) pair."""
+        subscriber: tuple[deque, Event] = (deque(maxlen=1), Event())
+        with self._subscribers_lock:
+            self._subscribers = (*self._subscribers, subscriber)
+        return subscriber
+
+    def write(self, buf: bytes, _monotonic_ns=time.monotonic_ns) -> int:
+        """Publish a new frame (mirrors main.py's _write_unlimited)."""
+        self.frame = buf
+        self._stats.record_frame(_monotonic_ns())
+        for slot, event in self._subscribers:
+            slot.append(buf)
+            event.set()
+        self.frame_available.set()
+        return len(buf)
+
+
+# Truthy parsing copied from main.py
+_TRUTHY = frozenset({"true", "1", "t", "yes", "y", "on"})
+
+
+def _truthy(value: str) -> bool:
+    return value in _TRUTHY or value.strip().lower() in _TRUTHY
+
+
+def test_frame_write_throughput(benchmark):
+    """Benchmark the encoder-side write path with a subscriber attached."""
+    stats = StreamStats()
+    buffer = FrameBuffer(stats)
+    buffer.subscribe()
+    frame = b"x" * 65536
+
+    def write_frames(write=buffer.write, frame=frame):
+        for _ in range(1000):
+            write(frame)
+
+    benchmark(write_frames)
+    assert stats._frame_count > 0
+
+
+def test_truthy_parse_throughput(benchmark):
+    """Benchmark boolean env-value parsing across common input shapes."""
+    values = ["true", "false", "1", "0", " True ", "YES", "", "on"]
+
+    def parse_all(values=values, truthy=_truthy):
+        return [truthy(v) for v in values]
+
+    results = benchmark(parse_all)
+    assert results == [True, False, True, False, True, True, False, True]
@@ -8,7 +8,7 @@ import signal
 import threading
 import time
 from collections import deque
-from threading import Condition, Event, Lock
+from threading import Event, Lock
 from typing import Optional
 
 import pytest
@@ -17,45 +17,41 @@ import pytest
 class StreamStats:
     """Test version of StreamStats class."""
 
+    FPS_WINDOW_FRAMES = 30
+
     def __init__(self) -> None:
         self._lock = Lock()
         self._frame_count: int = 0
-        self._last_frame_monotonic: Optional[float] = None
-        self._frame_times_monotonic: deque[float] = deque(maxlen=30)
+        self._last_frame_monotonic_ns: Optional[int] = None
+        self._window_start_monotonic_ns: Optional[int] = None
+        self._window_frames: int = 0
+        self._fps: float = 0.0
 
-    def record_frame(self, monotonic_timestamp: float) -> None:
-        """Record a new frame timestamp from a monotonic clock."""
+    def record_frame(self, monotonic_timestamp_ns: int) -> None:
+        """Record a new frame timestamp in time.monotonic_ns() nanoseconds."""
         with self._lock:
             self._frame_count += 1
-            self._last_frame_monotonic = monotonic_timestamp
-            self._frame_times_monotonic.append(monotonic_timestamp)
+            self._last_frame_monotonic_ns = monotonic_timestamp_ns
+            if self._window_frames == 0:
+                self._window_start_monotonic_ns = monotonic_timestamp_ns
+            self._window_frames += 1
+            if self._window_frames >= self.FPS_WINDOW_FRAMES:
+                time_span_ns = monotonic_timestamp_ns - self._window_start_monotonic_ns
+                if time_span_ns > 0:
+                    self._fps = (self._window_frames - 1) * 1e9 / time_span_ns
+                # The current frame opens the next window
+                self._window_start_monotonic_ns = monotonic_timestamp_ns
+                self._window_frames = 1
 
     def get_fps(self) -> float:
-        """Calculate actual FPS from frame times."""
-        with self._lock:
-            frame_times = list(self._frame_times_monotonic)
-        if len(frame_times) < 2:
-            return 0.0
-        time_span = frame_times[-1] - frame_times[0]
-        if time_span == 0:
-            return 0.0
-        return (len(frame_times) - 1) / time_span
-
-    def snapshot(self) -> tuple[int, Optional[float], float]:
-        """Return a snapshot of frame count, last frame time, and FPS."""
+        """Return the FPS computed over the last completed frame window."""
         with self._lock:
-            frame_count = self._frame_count
-            last_frame_time = self._last_frame_monotonic
-            frame_times = list(self._frame_times_monotonic)
-
-        # Calculate FPS outside lock using the snapshot
-        if len(frame_times) < 2:
-            current_fps = 0.0
-        else:
-            time_span = frame_times[-1] - frame_times[0]
-            current_fps = 0.0 if time_span == 0 else (len(frame_times) - 1) / time_span
+            return self._fps
 
-        return frame_count, last_frame_time, current_fps
+    def snapshot(self) -> tuple[int, Optional[int], float]:
+        """Return a snapshot of frame count, last frame time (ns), and FPS."""
+        with self._lock:
+            return self._frame_count, self._last_frame_monotonic_ns, self._fps
 
 
 class FrameBuffer(io.BufferedIOBase):
@@ -63,26 +59,60 @@ class FrameBuffer(io.BufferedIOBase):
 
     def __init__(self, stats: StreamStats, max_frame_size: Optional[int] = None) -> None:
         self.frame: Optional[bytes] = None
-        self.condition: Condition = Condition()
+        self.frame_available: Event = Event()
         self._stats = stats
         self._max_frame_size = max_frame_size
         self._dropped_frames = 0
-
-    def write(self, buf: bytes) -> int:
-        """Write a new frame to the output buffer."""
+        # Per-client latest-frame slots, immutable snapshot (mirrors main.py)
+        self._subscribers: tuple[tuple[deque, Event], ...] = ()
+        self._subscribers_lock = Lock()
+        # Select the write path once at construction (mirrors main.py)
+        self.write = (
+            self._write_limited if max_frame_size is not None else self._write_unlimited
+        )
+
+    def subscribe(self) -> tuple[deque, Event]:
+        """Register and return a per-client (frame slot, wake-up event) pair."""
+        subscriber: tuple[deque, Event] = (deque(maxlen=1), Event())
+        with self._subscribers_lock:
+            self._subscribers = (*self._subscribers, subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: tuple[deque, Event]) -> None:
+        """Remove a subscriber registered via subscribe()."""
+        with self._subscribers_lock:
+            self._subscribers = tuple(
+                s for s in self._subscribers if s is not subscriber
+            )
+
+    def _publish(self, buf: bytes) -> None:
+        """Deliver a frame to every subscriber's slot and wake it."""
+        for slot, event in self._subscribers:
+            slot.append(buf)
+            event.set()
+
+    def _write_unlimited(self, buf: bytes, _monotonic_ns=time.monotonic_ns) -> int:
+        """Publish a new frame with no size check (no limit configured)."""
+        self.frame = buf
+        self._stats.record_frame(_monotonic_ns())
+        self._publish(buf)
+        self.frame_available.set()
+        return len(buf)
+
+    def _write_limited(self, buf: bytes, _monotonic_ns=time.monotonic_ns) -> int:
+        """Publish a new frame, dropping any that exceed the size limit."""
         frame_size = len(buf)
 
         # Validate frame size to prevent memory exhaustion
-        if self._max_frame_size is not None and frame_size > self._max_frame_size:
+        if frame_size > self._max_frame_size:
             self._dropped_frames += 1
             # Return the size to satisfy encoder interface, but don't store the frame
             return frame_size
 
-        with self.condition:
-            self.frame = buf
-            monotonic_now = time.monotonic()
-            self._stats.record_frame(monotonic_now)
-            self.condition.notify_all()
+        self.frame = buf
+        self._stats.record_frame(_monotonic_ns())
+        self._publish(buf)
+        self.frame_available.set()
         return frame_size
 
     def get_dropped_frames(self) -> int:
@@ -103,7 +133,7 @@ class TestThreadSafety:
         def record_frames():
             try:
                 for _ in range(frames_per_thread):
-                    stats.record_frame(time.monotonic())
+                    stats.record_frame(time.monotonic_ns())
                     time.sleep(0.001)  # Small delay to increase contention
             except Exception as e:
                 errors.append(e)
@@ -128,7 +158,7 @@ class TestThreadSafety:
         
         # Pre-populate with some data
         for _ in range(30):
-            stats.record_frame(time.monotonic())
+            stats.record_frame(time.monotonic_ns())
             time.sleep(0.01)
 
         num_readers = 20
@@ -180,10 +210,11 @@ class TestThreadSafety:
                 for _ in range(50):
                     if stop_event.is_set():
                         break
-                    with buffer.condition:
-                        buffer.condition.wait(timeout=1.0)
-                        if buffer.frame is not None:
-                            frames_read += 1
+                    notified = buffer.frame_available.wait(timeout=1.0)
+                    if notified:
+                        buffer.frame_available.clear()
+                    if buffer.frame is not None:
+                        frames_read += 1
             except Exception as e:
                 errors.append(e)
 
@@ -204,6 +235,30 @@ class TestThreadSafety:
         assert frames_written > 0, "No frames were written"
         assert frames_read > 0, "No frames were read"
 
+    def test_subscribers_receive_latest_frame(self):
+        """Test that per-client slots deliver the newest frame and drop stale ones."""
+        stats = StreamStats()
+        buffer = FrameBuffer(stats)
+
+        subscriber = buffer.subscribe()
+        slot, event = subscriber
+
+        # Multiple writes before the client reads: newest frame wins
+        buffer.write(b"frame_1")
+        buffer.write(b"frame_2")
+        buffer.write(b"frame_3")
+
+        assert event.is_set()
+        assert slot.popleft() == b"frame_3"
+        assert len(slot) == 0
+
+        # After unsubscribing, writes no longer reach the slot
+        buffer.unsubscribe(subscriber)
+        event.clear()
+        buffer.write(b"frame_4")
+        assert not event.is_set()
+        assert len(slot) == 0
+
 
 class TestConcurrentStreamAccess:
     """Test concurrent stream access scenarios."""
@@ -425,12 +480,11 @@ class TestResourceExhaustion:
         max_timeouts = 3
         
         for _ in range(5):
-            with buffer.condition:
-                notified = buffer.condition.wait(timeout=0.1)
-                if not notified:
-                    timeout_count += 1
-                    if timeout_count >= max_timeouts:
-                        break
+            notified = buffer.frame_available.wait(timeout=0.1)
+            if not notified:
+                timeout_count += 1
+                if timeout_count >= max_timeouts:
+                    break
         
         # Should have hit the timeout limit
         assert timeout_count >= max_timeouts
@@ -496,16 +550,16 @@ class TestMonotonicTiming:
         stats = StreamStats()
         
         # Record a frame
-        frame_time = time.monotonic()
-        stats.record_frame(frame_time)
-        
+        frame_time_ns = time.monotonic_ns()
+        stats.record_frame(frame_time_ns)
+
         # Wait a bit
         time.sleep(0.1)
-        
+
         # Calculate age
-        _, last_frame_time, _ = stats.snapshot()
-        if last_frame_time is not None:
-            age = time.monotonic() - last_frame_time
+        _, last_frame_ns, _ = stats.snapshot()
+        if last_frame_ns is not None:
+            age = (time.monotonic_ns() - last_frame_ns) / 1e9
             assert age >= 0.1
             assert age < 1.0
 
@@ -3,103 +3,97 @@ Configuration tests - verify Docker Compose, Dockerfile, and .env files.
 """
 
 import ast
+import re
 
 import pytest
-import yaml
 
 
-def test_python_syntax(workspace_root):
-    """Test if main.py has valid Python syntax."""
-    main_py = workspace_root / "pi_camera_in_docker" / "main.py"
-    assert main_py.exists(), "main.py not found"
-
-    code = main_py.read_text()
-    # This will raise SyntaxError if invalid
-    ast.parse(code)
+# Marker groups scanned with one compiled-alternation pass per group instead
+# of a separate substring scan over the whole file for each marker
+_ENDPOINT_MARKERS = (
+    '@app.route("/")',
+    '@app.route("/health")',
+    '@app.route("/ready")',
+    '@app.route("/stream.mjpg")',
+)
 
+_ERROR_HANDLING_MARKERS = (
+    "except PermissionError",
+    "except RuntimeError",
+    "except Exception",
+    "finally:",
+)
 
-def test_docker_compose_valid_yaml(workspace_root):
-    """Test if docker-compose.yml is valid YAML."""
-    compose_file = workspace_root / "docker-compose.yml"
-    assert compose_file.exists(), "docker-compose.yml not found"
+_ENV_VAR_MARKERS = (
+    'os.environ.get("RESOLUTION"',
+    'os.environ.get("EDGE_DETECTION"',
+    'os.environ.get("FPS"',
+)
 
-    with open(compose_file) as f:
-        config = yaml.safe_load(f)
 
-    assert config is not None
-    assert "services" in config
+def _find_markers(source, markers):
+    """Return the subset of markers present in source via a single regex scan."""
+    pattern = re.compile("|".join(map(re.escape, markers)))
+    return set(pattern.findall(source))
 
 
-def test_docker_compose_has_service(workspace_root):
-    """Verify motion-in-ocean service is defined."""
-    compose_file = workspace_root / "docker-compose.yml"
+def test_python_syntax(main_source):
+    """Test if main.py has valid Python syntax."""
+    # This will raise SyntaxError if invalid
+    ast.parse(main_source)
 
-    with open(compose_file) as f:
-        config = yaml.safe_load(f)
 
-    assert "motion-in-ocean" in config["services"]
+def test_docker_compose_valid_yaml(compose_config):
+    """Test if docker-compose.yml is valid YAML."""
+    assert compose_config is not None
+    assert "services" in compose_config
 
 
-def test_docker_compose_required_fields(workspace_root):
-    """Verify required fields in docker-compose service."""
-    compose_file = workspace_root / "docker-compose.yml"
+def test_docker_compose_has_service(compose_config):
+    """Verify motion-in-ocean service is defined."""
+    assert "motion-in-ocean" in compose_config["services"]
 
-    with open(compose_file) as f:
-        config = yaml.safe_load(f)
 
-    service = config["services"]["motion-in-ocean"]
+def test_docker_compose_required_fields(compose_config):
+    """Verify required fields in docker-compose service."""
+    service = compose_config["services"]["motion-in-ocean"]
     required_fields = ["image", "restart", "ports", "healthcheck"]
 
     for field in required_fields:
         assert field in service, f"Missing required field: {field}"
 
 
-def test_docker_compose_environment_config(workspace_root):
+def test_docker_compose_environment_config(compose_config):
     """Verify environment configuration exists."""
-    compose_file = workspace_root / "docker-compose.yml"
-
-    with open(compose_file) as f:
-        config = yaml.safe_load(f)
-
-    service = config["services"]["motion-in-ocean"]
+    service = compose_config["services"]["motion-in-ocean"]
     # Either environment or env_file should be present
     assert "environment" in service or "env_file" in service
 
 
-def test_docker_compose_healthcheck(workspace_root):
+def test_docker_compose_healthcheck(compose_config):
     """Verify healthcheck configuration."""
-    compose_file = workspace_root / "docker-compose.yml"
-
-    with open(compose_file) as f:
-        config = yaml.safe_load(f)
-
-    service = config["services"]["motion-in-ocean"]
+    service = compose_config["services"]["motion-in-ocean"]
     healthcheck = service.get("healthcheck", {})
 
     assert "test" in healthcheck, "Missing healthcheck test"
     assert "/health" in str(healthcheck.get("test")), "Healthcheck should use /health endpoint"
 
 
-def test_docker_compose_device_mappings(workspace_root):
+def test_docker_compose_device_mappings(compose_config):
     """Verify device mappings are configured."""
-    compose_file = workspace_root / "docker-compose.yml"
-
-    with open(compose_file) as f:
-        config = yaml.safe_load(f)
-
-    service = config["services"]["motion-in-ocean"]
+    service = compose_config["services"]["motion-in-ocean"]
     devices = service.get("devices", [])
     device_cgroup_rules = service.get("device_cgroup_rules", [])
 
     assert len(devices) > 0, "No device mappings found"
     assert any("/dev/dma_heap" in str(d) for d in devices), "Missing /dev/dma_heap device"
     assert any("/dev/vchiq" in str(d) for d in devices), "Missing /dev/vchiq device"
-    
+
     # /dev/video* devices can be configured via explicit device mappings OR device_cgroup_rules
     # Check for either approach
     has_video_device_mapping = any("/dev/video" in str(d) for d in devices)
     has_video_cgroup_rule = any("81:*" in str(rule) for rule in device_cgroup_rules)
-    
+
     assert has_video_device_mapping or has_video_cgroup_rule, \
         "Missing /dev/video* device configuration (neither explicit mapping nor cgroup rule)"
 
@@ -114,47 +108,22 @@ def test_docker_compose_security(workspace_root):
         assert "# privileged: true" in content, "privileged mode should be commented"
 
 
-@pytest.mark.parametrize(
-    "endpoint,marker",
-    [
-        ("/", '@app.route("/")'),
-        ("/health", '@app.route("/health")'),
-        ("/ready", '@app.route("/ready")'),
-        ("/stream.mjpg", '@app.route("/stream.mjpg")'),
-    ],
-)
-def test_flask_endpoint_defined(workspace_root, endpoint, marker):
+def test_flask_endpoints_defined(main_source):
     """Verify Flask endpoints are defined in main.py."""
-    main_py = workspace_root / "pi_camera_in_docker" / "main.py"
-    code = main_py.read_text()
-    assert marker in code, f"Missing endpoint: {endpoint}"
+    missing = set(_ENDPOINT_MARKERS) - _find_markers(main_source, _ENDPOINT_MARKERS)
+    assert not missing, f"Missing endpoints: {missing}"
 
 
-@pytest.mark.parametrize(
-    "error_type,marker",
-    [
-        ("PermissionError", "except PermissionError"),
-        ("RuntimeError", "except RuntimeError"),
-        ("General exception", "except Exception"),
-        ("Try-finally", "finally:"),
-    ],
-)
-def test_error_handling_present(workspace_root, error_type, marker):
+def test_error_handling_present(main_source):
     """Verify error handling is present in main.py."""
-    main_py = workspace_root / "pi_camera_in_docker" / "main.py"
-    code = main_py.read_text()
-    assert marker in code, f"Missing {error_type} handling"
+    missing = set(_ERROR_HANDLING_MARKERS) - _find_markers(main_source, _ERROR_HANDLING_MARKERS)
+    assert not missing, f"Missing error handling: {missing}"
 
 
-@pytest.mark.parametrize(
-    "env_var",
-    ["RESOLUTION", "EDGE_DETECTION", "FPS"],
-)
-def test_environment_variable_handled(workspace_root, env_var):
+def test_environment_variables_handled(main_source):
     """Verify environment variables are handled in main.py."""
-    main_py = workspace_root / "pi_camera_in_docker" / "main.py"
-    code = main_py.read_text()
-    assert f'os.environ.get("{env_var}"' in code, f"Missing {env_var} handling"
+    missing = set(_ENV_VAR_MARKERS) - _find_markers(main_source, _ENV_VAR_MARKERS)
+    assert not missing, f"Missing environment variable handling: {missing}"
 
 
 def test_env_file_exists(workspace_root):
@@ -3,7 +3,6 @@ Integration tests - verify startup sequence, error recovery, and health checks.
 """
 
 import pytest
-import yaml
 
 
 def test_startup_sequence_markers(workspace_root):
@@ -77,7 +76,7 @@ def test_health_endpoints_present(workspace_root, endpoint, markers):
     [
         ("Frame count tracking", "self._frame_count += 1"),
         ("FPS calculation", "def get_fps"),
-        ("Frame timing", "self._frame_times_monotonic"),
+        ("Frame timing", "self._window_start_monotonic"),
         ("Status endpoint", "def get_stream_status"),
         ("Uptime tracking", "app.start_time"),
     ],
@@ -89,14 +88,9 @@ def test_metrics_collection(workspace_root, metric, marker):
     assert marker in code, f"Missing metric: {metric}"
 
 
-def test_device_security_explicit_devices(workspace_root):
+def test_device_security_explicit_devices(compose_config):
     """Verify explicit device mappings are used."""
-    compose_file = workspace_root / "docker-compose.yml"
-
-    with open(compose_file) as f:
-        config = yaml.safe_load(f)
-
-    service = config["services"]["motion-in-ocean"]
+    service = compose_config["services"]["motion-in-ocean"]
 
     # Should have devices list
     assert "devices" in service, "Missing devices configuration"
@@ -104,14 +98,9 @@ def test_device_security_explicit_devices(workspace_root):
     assert len(devices) > 0, "No devices configured"
 
 
-def test_device_security_no_new_privileges(workspace_root):
+def test_device_security_no_new_privileges(compose_config):
     """Verify security options are set."""
-    compose_file = workspace_root / "docker-compose.yml"
-
-    with open(compose_file) as f:
-        config = yaml.safe_load(f)
-
-    service = config["services"]["motion-in-ocean"]
+    service = compose_config["services"]["motion-in-ocean"]
     security_opt = service.get("security_opt", [])
 
     # Should have no-new-privileges or similar
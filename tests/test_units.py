@@ -3,44 +3,45 @@ Unit tests for Flask application components.
 Tests without requiring camera hardware.
 """
 
-import json
-
 import pytest
 
 
-def test_flask_routes():
+def test_flask_routes(flask_app):
     """Test that Flask routes are properly defined."""
-    try:
-        from flask import Flask
-    except ImportError:
-        pytest.skip("Flask not installed in this environment")
+    # Verify all expected routes are registered
+    expected_routes = {"/", "/health", "/ready", "/stream.mjpg"}
+    registered_routes = {rule.rule for rule in flask_app.url_map.iter_rules()}
 
-    app = Flask(__name__)
+    assert expected_routes.issubset(registered_routes), (
+        f"Missing routes: {expected_routes - registered_routes}"
+    )
 
-    # Define test routes same as in main.py
-    @app.route("/")
-    def index():
-        return "index"
 
-    @app.route("/health")
-    def health():
-        return json.dumps({"status": "healthy"}), 200
+def test_main_module_imports(app_dir, monkeypatch):
+    """Smoke test: main.py imports cleanly and serves the landing page.
 
-    @app.route("/ready")
-    def ready():
-        return json.dumps({"status": "ready"}), 200
+    Guards against module-scope regressions (e.g. template rendering or env
+    parsing at import time) that the marker-based tests cannot catch.
+    """
+    import importlib.util
+    import sys
 
-    @app.route("/stream.mjpg")
-    def video_feed():
-        return "stream"
+    pytest.importorskip("flask")
+    pytest.importorskip("flask_cors")
+    pytest.importorskip("numpy")
+    pytest.importorskip("PIL")
 
-    # Verify all expected routes are registered
-    expected_routes = {"/", "/health", "/ready", "/stream.mjpg"}
-    registered_routes = {rule.rule for rule in app.url_map.iter_rules()}
+    monkeypatch.setenv("MOCK_CAMERA", "true")
+    spec = importlib.util.spec_from_file_location("pi_cam_main_smoke", app_dir / "main.py")
+    module = importlib.util.module_from_spec(spec)
+    # Register before exec so Flask can resolve the app root (template and
+    # static paths) from the module's __file__
+    monkeypatch.setitem(sys.modules, spec.name, module)
+    spec.loader.exec_module(module)
 
-    assert expected_routes.issubset(registered_routes), (
-        f"Missing routes: {expected_routes - registered_routes}"
-    )
+    response = module.app.test_client().get("/")
+    assert response.status_code == 200
+    assert b"stream.mjpg" in response.data
 
 
 def test_dockerfile_has_flask(workspace_root):
@@ -50,11 +51,17 @@ def test_dockerfile_has_flask(workspace_root):
     assert dockerfile_path.exists(), "Dockerfile not found"
     assert requirements_path.exists(), "requirements.txt not found"
 
-    dockerfile_content = dockerfile_path.read_text().lower()
-    requirements_content = requirements_path.read_text().lower()
+    # Line-by-line scans with early exit - stop at the first match instead of
+    # materializing and lowercasing each whole file
+    with open(requirements_path, encoding="utf-8") as f:
+        has_requirements = any("flask" in line.lower() for line in f)
 
-    has_pip_install = "pip3 install" in dockerfile_content and "flask" in dockerfile_content.split("pip3 install", 1)[-1].split("\n")[0]
-    has_requirements = "flask" in requirements_content
+    has_pip_install = False
+    if not has_requirements:
+        with open(dockerfile_path, encoding="utf-8") as f:
+            has_pip_install = any(
+                "pip3 install" in line.lower() and "flask" in line.lower() for line in f
+            )
 
     assert has_pip_install or has_requirements, (
         "Flask not found in requirements.txt or Dockerfile pip install"
@@ -127,14 +134,18 @@ def test_streaming_output_class():
             self.frame_count = 0
             self.last_frame_time = time.time()
             self.frame_times = deque(maxlen=30)
+            # Bind hot-path lookups once so write() uses LOAD_FAST instead
+            # of re-resolving globals/attributes on every frame
+            self._now = time.time
+            self._append = self.frame_times.append
 
         def write(self, buf):
-            with self.condition:
+            cond = self.condition
+            with cond:
                 self.frame = buf
                 self.frame_count += 1
-                now = time.time()
-                self.frame_times.append(now)
-                self.condition.notify_all()
+                self._append(self._now())
+                cond.notify_all()
 
         def get_fps(self):
             if len(self.frame_times) < 2:
@@ -210,6 +221,12 @@ def test_healthcheck_url_validation_allows_valid_hostname(monkeypatch):
         def __exit__(self, exc_type, exc, tb):
             return False
 
+    class DummyPool:
+        def request(self, method, url, timeout=None, retries=None):
+            captured["url"] = url
+            captured["timeout"] = timeout
+            return DummyResponse()
+
     def fake_urlopen(url, timeout=None):
         captured["url"] = url
         captured["timeout"] = timeout
@@ -217,6 +234,8 @@ def test_healthcheck_url_validation_allows_valid_hostname(monkeypatch):
 
     monkeypatch.setenv("HEALTHCHECK_URL", "https://example.com/health")
     monkeypatch.setattr(urllib.request, "urlopen", fake_urlopen)
+    if healthcheck._POOL is not None:
+        monkeypatch.setattr(healthcheck, "_POOL", DummyPool())
 
     assert healthcheck.check_health() is True
     assert captured["url"] == "https://example.com/health"